@@ -16,6 +16,8 @@
 #   msconvert_centroid (optional, default "none": none|vendor|cwt),
 #   msconvert_gzip (optional, default false),
 #   msconvert_bit_depth (optional, default 64)
+#   msconvert_jobs (optional, default 4: parallel MSConvert processes)
+#   manifest_sha256 (optional, default false: hash outputs into the manifest)
 
 import os
 
@@ -41,6 +43,8 @@ rule convert_raw_to_mzml:
         centroid=config.get("msconvert_centroid", "none"),
         gzip="--gzip" if config.get("msconvert_gzip", False) else "",
         bit_depth=config.get("msconvert_bit_depth", 64),
+        sha256="--sha256" if config.get("manifest_sha256", False) else "",
+    threads: config.get("msconvert_jobs", 4)
     log:
         os.path.join(config["base_dir"], "logs", "msconvert.log"),
     shell:
@@ -52,6 +56,8 @@ rule convert_raw_to_mzml:
             --msconvert {params.msconvert} \
             --centroid {params.centroid} \
             --bit-depth {params.bit_depth} \
+            --jobs {threads} \
             {params.gzip} \
+            {params.sha256} \
             2>&1 | tee {log}
         """
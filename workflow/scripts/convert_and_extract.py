@@ -5,22 +5,30 @@ Full pipeline: raw -> MSConvert (centroided mzML) -> xtract_xml.exe (.ms1 + .ms2
 For each PXD dataset:
   1. MSConvert: raw/*.raw -> mzML/*.mzML (peakPicking vendor, metadataFixer)
   2. xtract_xml: mzML/*.mzML -> MS1_MS2/*.ms1 + *.HCD.*.ms2
+     (runs as each mzML is ready, overlapping step 1)
   3. Rename: *.HCD.*.ms2 -> *.ms2
   4. Create empty: RawData/*.raw (placeholders for EpiProfile)
   5. Clean up intermediate mzML (optional, saves disk space)
 
 Usage:
-  python convert_and_extract.py [--pxd PXD046034] [--skip-msconvert] [--keep-mzml]
+  python convert_and_extract.py [--pxd PXD046034] [--skip-msconvert] [--keep-mzml] [--jobs 4]
   python convert_and_extract.py --pxd PXD046034 --base D:/epiprofile_data
+  python convert_and_extract.py --pxd PXD046034 --tmpdir /dev/shm
   python convert_and_extract.py --pxd PXD046034 --msconvert /path/to/msconvert.exe --xtract /path/to/xtract_xml.exe
 """
 
 import argparse
+import atexit
+import json
 import os
 import pathlib
+import queue
 import shutil
 import subprocess
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Defaults (Windows local machine) -- override via CLI args or env vars
 DEFAULT_MSCONVERT = os.environ.get(
@@ -30,170 +38,466 @@ DEFAULT_XTRACT = os.environ.get(
     "XTRACT_PATH", r"D:\EpiProfile2.1_1Basic_Running_version\xtract_xml.exe"
 )
 DEFAULT_BASE = os.environ.get("EPIPROFILE_DATA", r"D:\epiprofile_data")
+DEFAULT_TMPDIR = os.environ.get("EPIPROFILE_TMPDIR")
 
 ALL_PXD = ["PXD046034", "PXD046788", "PXD014739"]
 
-
-def convert_raw_to_mzml(raw_dir, mzml_dir, msconvert_path):
-    """MSConvert: raw -> centroided mzML (full, no ms-level split)."""
+DEFAULT_JOBS = min(os.cpu_count() or 1, 4)
+# Threads for small independent file ops (placeholder creation, cleanup unlinks)
+FILE_OP_WORKERS = 32
+
+# Serialises console output from worker threads
+_PRINT_LOCK = threading.Lock()
+
+
+def run_logged(cmd, log_path, timeout, cwd=None):
+    """Run *cmd* with stdout+stderr written straight to *log_path*."""
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with log_path.open("wb") as logf:
+        subprocess.run(cmd, stdout=logf, stderr=subprocess.STDOUT,
+                       timeout=timeout, cwd=cwd, check=False)
+
+
+def log_tail(log_path, n=200):
+    """Last *n* bytes of *log_path*, decoded for display."""
+    try:
+        with log_path.open("rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - n))
+            return f.read().decode("utf-8", "replace").strip()
+    except OSError:
+        return ""
+
+
+def load_cache(cache_path):
+    """Load a {input path: {size, mtime_ns, output}} cache (empty if missing)."""
+    try:
+        return json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache_path, cache):
+    with cache_path.open("w", encoding="utf-8") as f:
+        json.dump(cache, f, separators=(",", ":"))
+
+
+def scan_sizes(d):
+    """Return {name: size} for the files in *d* from a single scandir pass."""
+    try:
+        with os.scandir(d) as it:
+            return {e.name: e.stat().st_size for e in it if e.is_file()}
+    except FileNotFoundError:
+        return {}
+
+
+def list_raw_files(raw_dir):
+    """Sorted .raw files in *raw_dir*; the extension is matched case-insensitively."""
+    try:
+        with os.scandir(raw_dir) as it:
+            return sorted(pathlib.Path(e.path) for e in it
+                          if e.is_file() and e.name.lower().endswith(".raw"))
+    except FileNotFoundError:
+        return []
+
+
+def summarize(d):
+    """Count and total size of .ms1 and .ms2 files in *d*, in one pass."""
+    ms1n = ms1s = ms2n = ms2s = 0
+    for name, size in scan_sizes(d).items():
+        if name.endswith(".ms1"):
+            ms1n += 1
+            ms1s += size
+        elif name.endswith(".ms2"):
+            ms2n += 1
+            ms2s += size
+    return ms1n, ms1s, ms2n, ms2s
+
+
+def file_size(p):
+    """Size of *p* in bytes, or 0 if it does not exist."""
+    try:
+        return p.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def is_cached(cache, src, st, out, out_size):
+    """True if *src* (stat'ed as *st*) is unchanged since it last produced
+    *out*, and *out* is still non-empty (*out_size* bytes)."""
+    entry = cache.get(str(src))
+    if entry is None or entry.get("output") != str(out):
+        return False
+    if (entry.get("size"), entry.get("mtime_ns")) != (st.st_size, st.st_mtime_ns):
+        return False
+    return out_size > 0
+
+
+def remember(cache, src, out, st):
+    """Record that *src* (stat'ed as *st* before running) produced *out*."""
+    cache[str(src)] = {
+        "size": st.st_size, "mtime_ns": st.st_mtime_ns, "output": str(out),
+    }
+
+
+def convert_raw_to_mzml(raw_dir, mzml_dir, msconvert_path, jobs=1, cache_path=None,
+                        on_done=None, log_dir=None, raw_files=None):
+    """MSConvert: raw -> centroided mzML (full, no ms-level split).
+
+    Runs up to *jobs* MSConvert processes concurrently (one per raw file).
+    Raw files unchanged since a successful run recorded in *cache_path*
+    are skipped. *on_done(mzml_path)*, if given, is called from the worker
+    for every mzML that is ready (converted or skipped). MSConvert output
+    goes to *log_dir*/<stem>.msconvert.log (default: <mzml_dir>/../logs).
+    *raw_files* restricts the run to those files (default: all in *raw_dir*).
+    """
     mzml_dir.mkdir(parents=True, exist_ok=True)
-    raw_files = sorted(raw_dir.glob("*.raw"))
+    log_dir = log_dir or mzml_dir.parent / "logs"
+    if raw_files is None:
+        raw_files = list_raw_files(raw_dir)
     total = len(raw_files)
     done = 0
     errors = []
+    cache = load_cache(cache_path) if cache_path else {}
+    existing = scan_sizes(mzml_dir)
+    # Same for every file: build once
+    msconvert_str = str(msconvert_path)
+    msconvert_opts = (
+        "--filter", "peakPicking vendor msLevel=1-",
+        "--filter", "metadataFixer",
+        "--outdir", str(mzml_dir),
+    )
 
-    for i, raw in enumerate(raw_files, 1):
+    def _convert_one(raw):
+        stem, ok, msg = _run_msconvert(raw)
+        if ok and on_done is not None:
+            on_done(mzml_dir / f"{stem}.mzML")
+        return stem, ok, msg
+
+    def _run_msconvert(raw):
         stem = raw.stem
         out = mzml_dir / f"{stem}.mzML"
-        if out.exists() and out.stat().st_size > 0:
-            done += 1
-            print(f"  [{i}/{total}] {stem} - already exists ({out.stat().st_size/1e6:.0f} MB), skip")
-            continue
-
-        print(f"  [{i}/{total}] {stem} - converting...", end=" ", flush=True)
+        out_size = existing.get(out.name, 0)
+        try:
+            raw_st = raw.stat()
+        except OSError as e:
+            return stem, False, f"ERROR: {e}"
+        if is_cached(cache, raw, raw_st, out, out_size):
+            return stem, True, f"already exists ({out_size/1e6:.0f} MB), skip"
+
+        with _PRINT_LOCK:
+            print(f"  {stem} - converting...", flush=True)
+        log_path = log_dir / f"{stem}.msconvert.log"
         t0 = time.time()
         try:
-            result = subprocess.run(
-                [
-                    msconvert_path, str(raw),
-                    "--filter", "peakPicking vendor msLevel=1-",
-                    "--filter", "metadataFixer",
-                    "--outdir", str(mzml_dir),
-                ],
-                capture_output=True, text=True, timeout=600
-            )
+            run_logged([msconvert_str, str(raw), *msconvert_opts],
+                       log_path, timeout=600)
             elapsed = time.time() - t0
-            if out.exists() and out.stat().st_size > 0:
+            out_size = file_size(out)
+            if out_size > 0:
+                remember(cache, raw, out, raw_st)
+                return stem, True, f"OK ({out_size/1e6:.0f} MB, {elapsed:.0f}s)"
+            err = f"FAIL (no output after {elapsed:.0f}s)"
+            tail = log_tail(log_path)
+            if tail:
+                err += f"\n    log ({log_path}): ...{tail}"
+            return stem, False, err
+        except subprocess.TimeoutExpired:
+            return stem, False, "TIMEOUT (600s)"
+        except Exception as e:
+            return stem, False, f"ERROR: {e}"
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as ex:
+        for i, (stem, ok, msg) in enumerate(ex.map(_convert_one, raw_files), 1):
+            if ok:
                 done += 1
-                print(f"OK ({out.stat().st_size/1e6:.0f} MB, {elapsed:.0f}s)")
             else:
                 errors.append(stem)
-                print(f"FAIL (no output after {elapsed:.0f}s)")
-                if result.stderr:
-                    print(f"    stderr: {result.stderr[:200]}")
+            with _PRINT_LOCK:
+                print(f"  [{i}/{total}] {stem} - {msg}")
+
+    if cache_path:
+        save_cache(cache_path, cache)
+    return done, errors
+
+
+def make_extractor(out_dir, xtract_path, cache, log_dir=None):
+    """Return extract_one(mzml) -> (stem, ok, message) for xtract_xml.exe.
+
+    mzML files unchanged since a successful run recorded in *cache* are
+    skipped; successful runs are recorded into it. xtract_xml output goes
+    to *log_dir*/<stem>.xtract.log (default: <out_dir>/../logs).
+    """
+    log_dir = log_dir or out_dir.parent / "logs"
+    existing = scan_sizes(out_dir)
+    # Same for every file: build once
+    xtract_cwd = str(pathlib.Path(xtract_path).parent)
+    xtract_args = (str(xtract_path), "-ms", "-o", str(out_dir))
+
+    def extract_one(mzml):
+        stem = mzml.stem
+        ms1_out = out_dir / f"{stem}.ms1"
+        try:
+            mzml_st = mzml.stat()
+        except OSError as e:
+            return stem, False, f"ERROR: {e}"
+        if is_cached(cache, mzml, mzml_st, ms1_out, existing.get(ms1_out.name, 0)):
+            return stem, True, "already extracted, skip"
+
+        with _PRINT_LOCK:
+            print(f"  {stem} - extracting...", flush=True)
+        log_path = log_dir / f"{stem}.xtract.log"
+        t0 = time.time()
+        try:
+            run_logged([*xtract_args, str(mzml)],
+                       log_path, timeout=300, cwd=xtract_cwd)
+            elapsed = time.time() - t0
+            if file_size(ms1_out) > 0:
+                remember(cache, mzml, ms1_out, mzml_st)
+                return stem, True, f"OK ({elapsed:.0f}s)"
+            err = f"FAIL after {elapsed:.0f}s"
+            tail = log_tail(log_path)
+            if tail:
+                err += f"\n    log ({log_path}): ...{tail}"
+            return stem, False, err
         except subprocess.TimeoutExpired:
-            errors.append(stem)
-            print("TIMEOUT (600s)")
+            return stem, False, "TIMEOUT (300s)"
         except Exception as e:
-            errors.append(stem)
-            print(f"ERROR: {e}")
+            return stem, False, f"ERROR: {e}"
+
+    return extract_one
 
-    return done, errors
 
+def extract_ms1_ms2(mzml_dir, out_dir, xtract_path, cache_path=None, log_dir=None):
+    """xtract_xml.exe: mzML -> .ms1 + .ms2 files.
 
-def extract_ms1_ms2(mzml_dir, out_dir, xtract_path):
-    """xtract_xml.exe: mzML -> .ms1 + .ms2 files."""
+    mzML files unchanged since a successful run recorded in *cache_path*
+    are skipped.
+    """
     out_dir.mkdir(parents=True, exist_ok=True)
     mzml_files = sorted(mzml_dir.glob("*.mzML"))
     total = len(mzml_files)
     done = 0
     errors = []
+    cache = load_cache(cache_path) if cache_path else {}
+    extract_one = make_extractor(out_dir, xtract_path, cache, log_dir)
 
     for i, mzml in enumerate(mzml_files, 1):
-        stem = mzml.stem
-        ms1_out = out_dir / f"{stem}.ms1"
-        if ms1_out.exists() and ms1_out.stat().st_size > 0:
+        stem, ok, msg = extract_one(mzml)
+        if ok:
             done += 1
-            print(f"  [{i}/{total}] {stem} - already extracted, skip")
-            continue
-
-        print(f"  [{i}/{total}] {stem} - extracting...", end=" ", flush=True)
-        t0 = time.time()
-        try:
-            result = subprocess.run(
-                [xtract_path, "-ms", "-o", str(out_dir), str(mzml)],
-                capture_output=True, text=True, timeout=300,
-                cwd=str(pathlib.Path(xtract_path).parent)
-            )
-            elapsed = time.time() - t0
-            if ms1_out.exists() and ms1_out.stat().st_size > 0:
-                done += 1
-                print(f"OK ({elapsed:.0f}s)")
-            else:
-                errors.append(stem)
-                print(f"FAIL after {elapsed:.0f}s")
-                if result.stderr:
-                    print(f"    stderr: {result.stderr[:200]}")
-        except subprocess.TimeoutExpired:
-            errors.append(stem)
-            print("TIMEOUT (300s)")
-        except Exception as e:
+        else:
             errors.append(stem)
-            print(f"ERROR: {e}")
+        print(f"  [{i}/{total}] {stem} - {msg}")
 
+    if cache_path:
+        save_cache(cache_path, cache)
     return done, errors
 
 
-def rename_ms2_files(out_dir):
+def convert_and_extract_overlapped(raw_dir, mzml_dir, out_dir, msconvert_path,
+                                   xtract_path, jobs=1, msconvert_cache=None,
+                                   xtract_cache=None, keep_mzml=False, log_dir=None,
+                                   raw_files=None, on_extracted=None):
+    """MSConvert and xtract_xml as a two-stage pipeline.
+
+    Each finished mzML goes through a bounded queue to one of *jobs*
+    xtract_xml workers, so extraction overlaps the remaining conversions
+    (a full queue holds MSConvert back). *on_extracted(mzml_path)*, if
+    given, is called from the worker after each successful extraction.
+    Unless *keep_mzml*, each mzML is then deleted to bound disk use.
+
+    Returns ((converted, conversion errors), (extracted, extraction
+    errors), bytes of mzML freed).
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cache = load_cache(xtract_cache) if xtract_cache else {}
+    extract_one = make_extractor(out_dir, xtract_path, cache, log_dir)
+    jobs = max(1, jobs)
+    mzml_queue = queue.Queue(maxsize=jobs)
+    extracted = 0
+    errors = []
+    freed = 0
+
+    def consumer():
+        nonlocal extracted, freed
+        while (mzml := mzml_queue.get()) is not None:
+            size = 0
+            try:
+                stem, ok, msg = extract_one(mzml)
+                if ok and on_extracted is not None:
+                    on_extracted(mzml)
+                # Only delete once on_extracted (the triad record) has
+                # returned; if it raised, the mzML stays for the next run
+                if ok and not keep_mzml:
+                    size = file_size(mzml)
+                    mzml.unlink(missing_ok=True)
+            except Exception as e:
+                # Keep draining: MSConvert blocks on a full queue, so a dead
+                # worker would eventually stall the whole pipeline
+                stem, ok, msg = mzml.stem, False, f"ERROR: {e}"
+            with _PRINT_LOCK:
+                if ok:
+                    extracted += 1
+                    freed += size
+                else:
+                    errors.append(stem)
+                print(f"  {stem} - xtract_xml {msg}")
+
+    workers = [threading.Thread(target=consumer, daemon=True) for _ in range(jobs)]
+    for t in workers:
+        t.start()
+    try:
+        converted = convert_raw_to_mzml(
+            raw_dir, mzml_dir, msconvert_path, jobs, msconvert_cache,
+            on_done=mzml_queue.put, log_dir=log_dir, raw_files=raw_files,
+        )
+    finally:
+        for _ in workers:
+            mzml_queue.put(None)
+        for t in workers:
+            t.join()
+
+    if xtract_cache:
+        save_cache(xtract_cache, cache)
+    return converted, (extracted, errors), freed
+
+
+def rename_ms2_files(out_dir, dry_run=False):
     """Rename sample.HCD.FTMS.ms2 (or any *.ms2 with extra parts) -> sample.ms2."""
-    renamed = 0
-    for f in out_dir.iterdir():
-        if f.suffix == ".ms2" and f.name.count(".") > 1:
-            # e.g. 3905_fas1.HCD.FTMS.ms2 -> 3905_fas1.ms2
-            stem_parts = f.name.split(".")
-            new_name = f"{stem_parts[0]}.ms2"
-            new_path = f.parent / new_name
-            if new_path.exists() and new_path != f:
-                new_path.unlink()
-            f.rename(new_path)
-            renamed += 1
-    return renamed
+    # Snapshot the listing first so renames don't disturb the enumeration
+    with os.scandir(out_dir) as it:
+        names = [e.name for e in it if e.name.endswith(".ms2") and e.name.count(".") > 1]
+    for name in names:
+        # e.g. 3905_fas1.HCD.FTMS.ms2 -> 3905_fas1.ms2
+        new_name = f"{name.split('.')[0]}.ms2"
+        if dry_run:
+            print(f"  would rename {name} -> {new_name}")
+            continue
+        os.replace(out_dir / name, out_dir / new_name)
+    return len(names)
 
 
 def create_raw_empty(out_dir, raw_data_dir):
     """Create empty .raw placeholder files matching each .ms1 file."""
     raw_data_dir.mkdir(parents=True, exist_ok=True)
-    created = 0
-    for ms1 in sorted(out_dir.glob("*.ms1")):
-        raw = raw_data_dir / f"{ms1.stem}.raw"
-        if not raw.exists():
-            raw.touch()
-            created += 1
-    return created
+    have = set(os.listdir(raw_data_dir))
+    with os.scandir(out_dir) as it:
+        stems = sorted(e.name[:-len(".ms1")] for e in it if e.name.endswith(".ms1"))
+    missing = [raw_data_dir / f"{stem}.raw" for stem in stems if f"{stem}.raw" not in have]
+    # Independent metadata ops: overlap their latency (SMB/NTFS especially)
+    with ThreadPoolExecutor(max_workers=FILE_OP_WORKERS) as ex:
+        list(ex.map(lambda p: open(p, "wb").close(), missing))
+    return len(missing)
 
 
-def cleanup_extras(out_dir):
+def cleanup_extras(out_dir, dry_run=False):
     """Remove .rawInfo, .xtract temp files from xtract output dir."""
-    removed = 0
-    for pattern in ["*.rawInfo", "*.xtract"]:
-        for f in out_dir.glob(pattern):
-            f.unlink()
-            removed += 1
-    return removed
+    with os.scandir(out_dir) as it:
+        extras = [e.path for e in it if e.name.endswith((".rawInfo", ".xtract"))]
+    if dry_run:
+        for path in extras:
+            print(f"  would remove {os.path.basename(path)}")
+        return len(extras)
+    with ThreadPoolExecutor(max_workers=FILE_OP_WORKERS) as ex:
+        list(ex.map(os.unlink, extras))
+    return len(extras)
 
 
 def process_pxd(pxd, base_dir, msconvert_path, xtract_path,
-                skip_msconvert=False, keep_mzml=False):
-    """Full pipeline for one PXD dataset."""
+                skip_msconvert=False, keep_mzml=False, jobs=1, dry_run=False,
+                tmpdir=None):
+    """Full pipeline for one PXD dataset.
+
+    With *dry_run*, only report the renames/removals the tidy-up steps
+    would make in an existing MS1_MS2/ folder. With *tmpdir*, the
+    intermediate mzML goes to a throwaway folder there (e.g. a ramdisk)
+    instead of <pxd>/mzML/.
+    """
     pxd_dir = base_dir / pxd
     raw_dir = pxd_dir / "raw"
     mzml_dir = pxd_dir / "mzML"
     out_dir = pxd_dir / "MS1_MS2"
     raw_data_dir = pxd_dir / "RawData"
+    log_dir = pxd_dir / "logs"
+    msconvert_cache = pxd_dir / "msconvert_cache.json"
+    xtract_cache = pxd_dir / "xtract_cache.json"
+    triad_cache = pxd_dir / "triad_cache.json"
 
-    n_raw = len(list(raw_dir.glob("*.raw")))
+    raw_files = list_raw_files(raw_dir)
+    n_raw = len(raw_files)
     print(f"\n{'='*60}")
     print(f"  {pxd}: {n_raw} raw files")
     print(f"{'='*60}")
 
-    # Step 1: MSConvert
+    if dry_run:
+        print(f"\n[Dry run] No tools run, no files changed")
+        if not out_dir.is_dir():
+            print(f"  {out_dir} does not exist yet")
+            return True
+        renamed = rename_ms2_files(out_dir, dry_run=True)
+        removed = cleanup_extras(out_dir, dry_run=True)
+        print(f"  Would rename {renamed} and remove {removed} files")
+        return True
+
+    if tmpdir:
+        mzml_dir = pathlib.Path(tempfile.mkdtemp(dir=tmpdir, prefix=f"{pxd}_mzml_"))
+        atexit.register(shutil.rmtree, mzml_dir, ignore_errors=True)
+        # Paths are new every run, so the skip caches could never hit
+        msconvert_cache = xtract_cache = None
+        print(f"  Intermediate mzML: {mzml_dir}")
+
+    # Steps 1+2: MSConvert and xtract_xml, overlapped
+    freed = 0
     if not skip_msconvert:
-        print(f"\n[Step 1] MSConvert: raw -> mzML")
-        done, errors = convert_raw_to_mzml(raw_dir, mzml_dir, msconvert_path)
-        print(f"  Result: {done}/{n_raw} converted, {len(errors)} errors")
+        print(f"\n[Step 1+2] MSConvert -> xtract_xml: raw -> mzML -> .ms1 + .ms2")
+        # A raw file unchanged since it last produced its final .ms1 + .ms2
+        # skips both tools (the mzML is gone by then unless --keep-mzml).
+        # An interrupted run may have left xtract's ms2 names behind.
+        if out_dir.is_dir():
+            rename_ms2_files(out_dir)
+        triads = load_cache(triad_cache)
+        outputs = scan_sizes(out_dir)
+        pending = {}
+        for raw in raw_files:
+            st = raw.stat()
+            out_size = min(outputs.get(f"{raw.stem}.ms1", 0),
+                           outputs.get(f"{raw.stem}.ms2", 0))
+            if not is_cached(triads, raw, st, out_dir / f"{raw.stem}.ms1", out_size):
+                pending[raw] = st
+        if len(pending) < n_raw:
+            print(f"  {n_raw - len(pending)} raw files already complete, skip")
+        by_stem = {raw.stem: (raw, st) for raw, st in pending.items()}
+        triad_lock = threading.Lock()
+
+        def record_triad(mzml):
+            # Saved per file, before the mzML is deleted, so a failed or
+            # interrupted run still skips the files it finished
+            raw, st = by_stem[mzml.stem]
+            with triad_lock:
+                remember(triads, raw, out_dir / f"{mzml.stem}.ms1", st)
+                save_cache(triad_cache, triads)
+
+        (done, errors), (x_done, x_errors), freed = convert_and_extract_overlapped(
+            raw_dir, mzml_dir, out_dir, msconvert_path, xtract_path, jobs,
+            msconvert_cache, xtract_cache, keep_mzml, log_dir, list(pending),
+            on_extracted=record_triad,
+        )
+        print(f"  Result: {done}/{len(pending)} converted, {len(errors)} errors")
+        print(f"  Result: {x_done}/{done} extracted, {len(x_errors)} errors")
+        if x_errors:
+            print(f"  xtract_xml failed: {sorted(x_errors)}")
         if errors:
-            print(f"  Failed: {errors}")
+            print(f"  MSConvert failed: {errors}")
             return False
     else:
         print(f"\n[Step 1] MSConvert: SKIPPED (--skip-msconvert)")
-
-    # Step 2: xtract_xml
-    n_mzml = len(list(mzml_dir.glob("*.mzML")))
-    print(f"\n[Step 2] xtract_xml: mzML -> .ms1 + .ms2 ({n_mzml} files)")
-    done, errors = extract_ms1_ms2(mzml_dir, out_dir, xtract_path)
-    print(f"  Result: {done}/{n_mzml} extracted, {len(errors)} errors")
-    if errors:
-        print(f"  Failed: {errors}")
+        n_mzml = sum(1 for n in scan_sizes(mzml_dir) if n.endswith(".mzML"))
+        print(f"\n[Step 2] xtract_xml: mzML -> .ms1 + .ms2 ({n_mzml} files)")
+        done, errors = extract_ms1_ms2(mzml_dir, out_dir, xtract_path, xtract_cache, log_dir)
+        print(f"  Result: {done}/{n_mzml} extracted, {len(errors)} errors")
+        if errors:
+            print(f"  xtract_xml failed: {errors}")
 
     # Step 3: Rename ms2
     print(f"\n[Step 3] Rename *.HCD.*.ms2 -> *.ms2")
@@ -212,16 +516,13 @@ def process_pxd(pxd, base_dir, msconvert_path, xtract_path,
     # Step 6: optionally delete mzML
     if not keep_mzml:
         print(f"\n[Step 5] Deleting intermediate mzML/ to save space...")
-        sz = sum(f.stat().st_size for f in mzml_dir.glob("*.mzML"))
+        sz = freed + sum(sz for n, sz in scan_sizes(mzml_dir).items() if n.endswith(".mzML"))
         shutil.rmtree(mzml_dir)
         print(f"  Freed {sz/1e9:.1f} GB")
 
     # Summary
-    n_ms1 = len(list(out_dir.glob("*.ms1")))
-    n_ms2 = len(list(out_dir.glob("*.ms2")))
-    n_raw_e = len(list(raw_data_dir.glob("*.raw")))
-    ms1_sz = sum(f.stat().st_size for f in out_dir.glob("*.ms1"))
-    ms2_sz = sum(f.stat().st_size for f in out_dir.glob("*.ms2"))
+    n_ms1, ms1_sz, n_ms2, ms2_sz = summarize(out_dir)
+    n_raw_e = sum(1 for n in scan_sizes(raw_data_dir) if n.endswith(".raw"))
 
     print(f"\n  DONE: {n_ms1} .ms1 ({ms1_sz/1e9:.1f} GB) + {n_ms2} .ms2 ({ms2_sz/1e9:.1f} GB) + {n_raw_e} .raw (empty)")
     ok = n_ms1 == n_raw and n_ms2 == n_raw and n_raw_e == n_raw
@@ -255,7 +556,20 @@ Examples:
                         help="Skip MSConvert step (use existing mzML)")
     parser.add_argument("--keep-mzml", action="store_true",
                         help="Keep intermediate mzML files (default: delete to save space)")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS,
+                        help=f"Parallel MSConvert processes (default: {DEFAULT_JOBS})")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only list the .ms2 renames and temp-file removals that would be made")
+    parser.add_argument("--tmpdir",
+                        help="Write intermediate mzML to a temporary folder here, e.g. a "
+                             "ramdisk like /dev/shm (default: $EPIPROFILE_TMPDIR unless "
+                             "--keep-mzml/--skip-msconvert, else <pxd>/mzML)")
     args = parser.parse_args()
+    if args.keep_mzml or args.skip_msconvert:
+        if args.tmpdir:
+            parser.error("--tmpdir cannot be combined with --keep-mzml or --skip-msconvert")
+    elif args.tmpdir is None:
+        args.tmpdir = DEFAULT_TMPDIR
 
     base_dir = pathlib.Path(args.base)
     msconvert_path = args.msconvert
@@ -265,13 +579,15 @@ Examples:
     print(f"xtract_xml: {xtract_path}")
     print(f"Base dir: {base_dir}")
     print(f"Datasets: {args.pxd}")
+    print(f"Jobs: {args.jobs}")
 
     t0 = time.time()
     results = {}
     for pxd in args.pxd:
         results[pxd] = process_pxd(
             pxd, base_dir, msconvert_path, xtract_path,
-            args.skip_msconvert, args.keep_mzml,
+            args.skip_msconvert, args.keep_mzml, args.jobs, args.dry_run,
+            args.tmpdir,
         )
 
     elapsed = time.time() - t0
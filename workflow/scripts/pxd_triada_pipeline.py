@@ -25,25 +25,35 @@ Example:
 from __future__ import annotations
 
 import argparse
+import gzip
 import hashlib
 import json
 import os
 import re
 import shutil
+import stat
 import subprocess
 import sys
+import tempfile
+import threading
 import time
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
+try:
+    from lxml import etree  # type: ignore
+except ImportError:  # optional: split_mzml_by_mslevel falls back to lines
+    etree = None
+
 
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
 
 # Multi-dot extensions MUST come before their single-dot prefixes so that
-# matching works correctly (we test with str.endswith, longest first).
+# matching works correctly (longest first).
 RAW_EXTS_ORDERED = [
     ".wiff2.scan",
     ".wiff.scan",
@@ -59,8 +69,35 @@ PAIR_MAP = {
     ".wiff2": ".wiff2.scan",
 }
 
+# One anchored, case-insensitive pattern for all raw extensions; the
+# leftmost match is the longest suffix
+_RAW_EXT_RE = re.compile(
+    "(" + "|".join(map(re.escape, RAW_EXTS_ORDERED)) + r")\Z", re.IGNORECASE
+)
+
+# Tuple form for a single-call str.endswith check
+COMPANION_EXTS = tuple(PAIR_MAP.values())
+
 VALID_PROTOCOLS = {"ftp", "aspera", "globus", "s3"}
 
+# msconvert filters per centroiding mode (must be FIRST per ProteoWizard docs)
+CENTROID_FILTERS: dict[str, tuple[str, ...]] = {
+    "none":   (),
+    "vendor": ("peakPicking vendor msLevel=1-", "metadataFixer"),
+    "cwt":    ("peakPicking cwt msLevel=1-", "metadataFixer"),
+}
+
+DEFAULT_JOBS = min(os.cpu_count() or 1, 4)
+
+# Concurrent FTP connections for ppx downloads (servers typically allow 4-8)
+DOWNLOAD_WORKERS = 8
+
+# Threads used to create empty placeholder files
+PLACEHOLDER_WORKERS = 32
+
+# Serialises console output when several conversions run concurrently
+_PRINT_LOCK = threading.Lock()
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -68,24 +105,31 @@ VALID_PROTOCOLS = {"ftp", "aspera", "globus", "s3"}
 
 def get_raw_ext(name: str) -> Optional[str]:
     """Return the raw extension of *name* (longest match first), or None."""
-    lower = name.lower()
-    for ext in RAW_EXTS_ORDERED:
-        if lower.endswith(ext):
-            return ext
-    return None
+    m = _RAW_EXT_RE.search(name)
+    return m.group(1).lower() if m else None
+
 
+def iter_raw_candidates(root: Path | str):
+    """
+    Yield vendor raw files/folders under *root* without stat'ing entries.
 
-def is_raw_candidate(p: Path) -> bool:
-    """Check whether *p* looks like a vendor raw file/folder."""
-    if p.is_dir():
-        return p.suffix.lower() == ".d"
-    return get_raw_ext(p.name) is not None
+    Uses the dirent type cached by os.scandir; ``.d`` folders are yielded
+    as a whole and not descended into.
+    """
+    with os.scandir(root) as it:
+        for e in it:
+            if e.is_dir(follow_symlinks=False):
+                if e.name.lower().endswith(".d"):
+                    yield Path(e.path)
+                else:
+                    yield from iter_raw_candidates(e.path)
+            elif get_raw_ext(e.name) is not None:
+                yield Path(e.path)
 
 
 def is_companion(p: Path) -> bool:
     """True if the file is a WIFF/WIFF2 companion (.wiff.scan, .wiff2.scan)."""
-    lower = p.name.lower()
-    return lower.endswith(".wiff.scan") or lower.endswith(".wiff2.scan")
+    return p.name.lower().endswith(COMPANION_EXTS)
 
 
 def safe_stem(raw_path: Path) -> str:
@@ -96,49 +140,87 @@ def safe_stem(raw_path: Path) -> str:
     return raw_path.stem
 
 
+def input_fingerprint(path: Path) -> tuple[int, int]:
+    """
+    (size, mtime_ns) of a raw input, used to detect changes between runs.
+
+    A Bruker ``.d`` folder's own stat says nothing about files rewritten
+    inside it, so for folders this is the total size and the newest
+    mtime over everything they contain.
+    """
+    st = path.stat()
+    if not stat.S_ISDIR(st.st_mode):
+        return st.st_size, st.st_mtime_ns
+    size, mtime_ns = 0, st.st_mtime_ns
+    stack = [str(path)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for e in it:
+                est = e.stat(follow_symlinks=False)
+                mtime_ns = max(mtime_ns, est.st_mtime_ns)
+                if e.is_dir(follow_symlinks=False):
+                    stack.append(e.path)
+                else:
+                    size += est.st_size
+    return size, mtime_ns
+
+
 def sha256_file(path: Path, chunk_size: int = 1 << 20) -> str:
-    h = hashlib.sha256()
     with path.open("rb") as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+: hash loop in C
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
         while True:
             b = f.read(chunk_size)
             if not b:
                 break
             h.update(b)
-    return h.hexdigest()
+        return h.hexdigest()
 
 
 def run_cmd(cmd: list[str], log_path: Optional[Path] = None) -> str:
     """Run a command; capture stdout+stderr; write to log; raise on failure."""
-    print(f"  $ {' '.join(cmd)}")
+    with _PRINT_LOCK:
+        print(f"  $ {' '.join(cmd)}")
     proc = subprocess.Popen(
         cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,
+        bufsize=0,
     )
-    out_lines: list[str] = []
+    # Copy raw 64 KiB blocks; decoding happens once, at the end
+    buf = bytearray()
     assert proc.stdout is not None
-    for line in proc.stdout:
-        out_lines.append(line)
-        # Print progress dots for long-running commands
-        if len(out_lines) % 100 == 0:
-            print(f"    ... {len(out_lines)} lines of output ...", flush=True)
+    fd = proc.stdout.fileno()
+    while True:
+        chunk = os.read(fd, 1 << 16)
+        if not chunk:
+            break
+        buf.extend(chunk)
+    proc.stdout.close()
     rc = proc.wait()
 
-    combined = "".join(out_lines)
     if log_path:
         log_path.parent.mkdir(parents=True, exist_ok=True)
-        log_path.write_text(combined, encoding="utf-8")
+        log_path.write_bytes(buf)
 
+    combined = buf.decode("utf-8", "replace")
     if rc != 0:
-        tail = "".join(out_lines[-50:])
+        tail = "".join(combined.splitlines(keepends=True)[-50:])
         raise RuntimeError(
             f"Command failed (rc={rc}): {' '.join(cmd)}\n--- tail ---\n{tail}"
         )
     return combined
 
 
+def write_json(path: Path, obj) -> None:
+    """Stream *obj* to *path* as compact JSON (no intermediate string)."""
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(obj, f, separators=(",", ":"))
+
+
 def which_or_die(tool: str) -> str:
     p = shutil.which(tool)
     if not p:
@@ -205,9 +287,7 @@ def download_with_pridepy(
         total_bytes += size
         file_summary.append({"fileName": name, "fileSizeBytes": size})
 
-    (log_dir / f"{pxd}.pridepy_file_list.json").write_text(
-        json.dumps(file_summary, indent=2), encoding="utf-8"
-    )
+    write_json(log_dir / f"{pxd}.pridepy_file_list.json", file_summary)
     print(f"  [pridepy] Found {len(file_list)} raw files ({total_bytes/1e9:.1f} GB total).")
 
     # Use the batch download method
@@ -224,8 +304,10 @@ def download_with_pridepy(
     print(f"  [pridepy] Download complete.")
 
 
-def download_with_ppx(pxd: str, out_raw: Path) -> None:
-    """Fallback using ppx (PRIDE/MassIVE)."""
+def download_with_ppx(
+    pxd: str, out_raw: Path, jobs: int = DOWNLOAD_WORKERS,
+) -> None:
+    """Fallback using ppx (PRIDE/MassIVE), *jobs* files at a time."""
     try:
         import ppx  # type: ignore
     except ImportError as e:
@@ -252,14 +334,235 @@ def download_with_ppx(pxd: str, out_raw: Path) -> None:
     wanted_sorted = sorted(wanted)
     log_dir = out_raw.parent / "logs"
     log_dir.mkdir(parents=True, exist_ok=True)
-    (log_dir / f"{pxd}.ppx_selected_files.json").write_text(
-        json.dumps(wanted_sorted, indent=2), encoding="utf-8"
-    )
+    write_json(log_dir / f"{pxd}.ppx_selected_files.json", wanted_sorted)
+
+    # ppx keeps one FTP connection per project and quits it after each
+    # file, so every worker thread gets a project (connection) of its own
+    per_thread = threading.local()
 
-    print(f"  [ppx] Downloading {len(wanted_sorted)} files ...")
-    for i, f in enumerate(wanted_sorted, 1):
-        print(f"  [{i}/{len(wanted_sorted)}] {f}")
-        proj.download(f)
+    def fetch(f: str) -> None:
+        if not hasattr(per_thread, "proj"):
+            per_thread.proj = ppx.find_project(pxd, local=str(out_raw))
+        per_thread.proj.download(f)
+
+    print(f"  [ppx] Downloading {len(wanted_sorted)} files ({jobs} at a time) ...")
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as ex:
+        futs = {ex.submit(fetch, f): f for f in wanted_sorted}
+        try:
+            for i, fut in enumerate(as_completed(futs), 1):
+                fut.result()
+                print(f"  [{i}/{len(futs)}] {futs[fut]}")
+        except BaseException:
+            # Fail fast: only wait for the downloads already running
+            for fut in futs:
+                fut.cancel()
+            raise
+
+
+# ---------------------------------------------------------------------------
+# mzML splitting
+# ---------------------------------------------------------------------------
+
+MZML_NS = "http://psi.hupo.org/ms/mzml"
+
+_MS_LEVEL_RE = re.compile(rb'accession="MS:1000511"[^>]*?value="(\d+)"')
+_INDEX_ATTR_RE = re.compile(rb'\bindex="\d+"')
+_COUNT_ATTR_RE = re.compile(rb'\bcount="\d+"')
+_INDEXED_OPEN_RE = re.compile(rb"<indexedmzML\b[^>]*>[ \t]*\r?\n?")
+_SPECTRUM_LIST_RE = re.compile(rb"<spectrumList\b[^>]*>")
+_SPECTRUM_LIST_LINE_RE = re.compile(rb"<spectrumList\b[^>]*>[ \t]*(?:\r?\n)?")
+# Namespace declarations lxml repeats on every serialised spectrum
+_XMLNS_DECL_RE = re.compile(rb'\s+xmlns(?::[\w.-]+)?="[^"]*"')
+# Bytes reserved in <spectrumList ...> for count="N", patched at the end
+_COUNT_FIELD_WIDTH = 24
+
+
+class _SplitOutput:
+    """
+    One output of split_mzml_by_mslevel, written to a seekable binary file.
+
+    The indexedmzML wrapper is dropped (its byte offsets would be wrong),
+    spectrum ``index`` attributes are renumbered and the ``spectrumList``
+    count is patched in place once known.
+    """
+
+    def __init__(self, f) -> None:
+        self.f = f
+        self.n = 0
+        self._count_pos: Optional[int] = None
+
+    def header(self, data: bytes) -> None:
+        """Write everything up to and including the <spectrumList> tag."""
+        data = _INDEXED_OPEN_RE.sub(b"", data, count=1)
+        m = _SPECTRUM_LIST_RE.search(data)
+        c = _COUNT_ATTR_RE.search(data, m.start(), m.end()) if m else None
+        if c is None:
+            self.f.write(data)
+            return
+        self.f.write(data[: c.start()])
+        self._count_pos = self.f.tell()
+        self.f.write(b'count="0"'.ljust(_COUNT_FIELD_WIDTH))
+        self.f.write(data[c.end():])
+
+    def spectrum(self, data: bytes) -> None:
+        self.f.write(_INDEX_ATTR_RE.sub(b'index="%d"' % self.n, data, count=1))
+        self.n += 1
+
+    def footer(self, data: bytes) -> None:
+        """Write from </spectrumList> up to and including </mzML>."""
+        self.f.write(data)
+
+    def finish(self) -> int:
+        if self._count_pos is not None:
+            self.f.seek(self._count_pos)
+            self.f.write((b'count="%d"' % self.n).ljust(_COUNT_FIELD_WIDTH))
+        return self.n
+
+
+def _split_lines(src, ms1: _SplitOutput, ms2: _SplitOutput) -> None:
+    """Line-based split; relies on msconvert's one-element-per-line output."""
+    chunk: list[bytes] = []
+    state = "header"
+    for line in src:
+        if state == "header":
+            chunk.append(line)
+            if b"<spectrumList" in line:
+                head = b"".join(chunk)
+                ms1.header(head)
+                ms2.header(head)
+                chunk = []
+                # <spectrumList count="0"/> has no </spectrumList> to wait for
+                m = _SPECTRUM_LIST_RE.search(line)
+                state = "footer" if m and m.group().endswith(b"/>") else "spectra"
+        elif state == "spectra":
+            if chunk or line.lstrip().startswith(b"<spectrum "):
+                chunk.append(line)
+                if b"</spectrum>" in line:
+                    body = b"".join(chunk)
+                    chunk = []
+                    m = _MS_LEVEL_RE.search(body)
+                    if m:
+                        (ms1 if int(m.group(1)) == 1 else ms2).spectrum(body)
+            elif b"</spectrumList>" in line:
+                chunk = [line]
+                state = "footer"
+            else:
+                ms1.f.write(line)
+                ms2.f.write(line)
+        else:
+            chunk.append(line)
+            if b"</mzML>" in line:
+                break
+    if state == "footer":
+        tail = b"".join(chunk)
+        ms1.footer(tail)
+        ms2.footer(tail)
+
+
+def _read_header(f, block: int = 1 << 16) -> bytes:
+    """Bytes of *f* through the <spectrumList> tag and the rest of its line."""
+    data = b""
+    while True:
+        b = f.read(block)
+        data += b
+        m = _SPECTRUM_LIST_LINE_RE.search(data)
+        # Read on if the match may stop short at the end of the buffer
+        if m and (len(data) - m.end() >= 2 or not b):
+            return data[: m.end()]
+        if not b:
+            return data
+
+
+def _read_footer(f, start: int = 0, block: int = 1 << 20) -> bytes:
+    """
+    Bytes of *f* from the last </spectrumList> line through </mzML>.
+
+    Without a </spectrumList> (a self-closing ``<spectrumList/>``), starts
+    at offset *start*, the end of the header.
+    """
+    end = f.seek(0, os.SEEK_END)
+    pos = end
+    while True:
+        pos = max(start, pos - block)
+        f.seek(pos)
+        data = f.read(end - pos)
+        i = data.rfind(b"</spectrumList>")
+        if i >= 0:
+            # Start at the line's indentation, like the line-based split
+            s = data.rfind(b"\n", 0, i) + 1
+            if not data[s:i].strip():
+                i = s
+            break
+        if pos == start:
+            i = 0
+            break
+    j = data.find(b"</mzML>", i)
+    return data[i: j + len(b"</mzML>")] + b"\n" if j >= 0 else data[i:]
+
+
+def _split_lxml(path: Path, ms1: _SplitOutput, ms2: _SplitOutput) -> None:
+    """
+    iterparse-based split; independent of the source line layout.
+
+    On msconvert output this writes the same bytes as :func:`_split_lines`.
+    """
+    with path.open("rb") as f:
+        head = _read_header(f)
+        foot = _read_footer(f, len(head))
+    ms1.header(head)
+    ms2.header(head)
+    cv_level = f"{{{MZML_NS}}}cvParam[@accession='MS:1000511']"
+    for _, elem in etree.iterparse(
+        str(path), events=("end",), tag=f"{{{MZML_NS}}}spectrum", huge_tree=True,
+    ):
+        cv = elem.find(cv_level)
+        if cv is not None:
+            # Reuse the source indentation: the whitespace before this spectrum
+            prev = elem.getprevious()
+            ws = (prev.tail if prev is not None else elem.getparent().text) or ""
+            indent = ws.rpartition("\n")[2].encode()
+            out = ms1 if int(cv.get("value")) == 1 else ms2
+            data = etree.tostring(elem, with_tail=False)
+            # Drop the xmlns/xmlns:xsi declarations lxml copies onto the
+            # start tag; they are already in scope from <mzML>
+            end = data.index(b">")
+            data = _XMLNS_DECL_RE.sub(b"", data[:end]) + data[end:]
+            out.spectrum(indent + data + b"\n")
+        # Keep memory at one spectrum
+        elem.clear(keep_tail=True)
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+    ms1.footer(foot)
+    ms2.footer(foot)
+
+
+def split_mzml_by_mslevel(
+    full_mzml: Path, ms1_out: Path, ms2_out: Path,
+) -> tuple[int, int]:
+    """
+    Split *full_mzml* into an MS1-only and an MS2+ mzML in a single pass.
+
+    Uses lxml's iterparse when available, else a line-based splitter for
+    msconvert output. Outputs ending in ``.gz`` are written plain first and
+    then compressed, since the spectrum count is patched with a seek.
+    Returns the number of spectra written to each output.
+    """
+    plain = [out.with_suffix("") if out.suffix == ".gz" else out
+             for out in (ms1_out, ms2_out)]
+    with plain[0].open("wb") as f1, plain[1].open("wb") as f2:
+        ms1, ms2 = _SplitOutput(f1), _SplitOutput(f2)
+        if etree is not None:
+            _split_lxml(full_mzml, ms1, ms2)
+        else:
+            with full_mzml.open("rb") as src:
+                _split_lines(src, ms1, ms2)
+        counts = ms1.finish(), ms2.finish()
+    for p, out in zip(plain, (ms1_out, ms2_out)):
+        if p != out:
+            with p.open("rb") as f_in, gzip.open(out, "wb") as f_out:
+                shutil.copyfileobj(f_in, f_out)
+            p.unlink()
+    return counts
 
 
 # ---------------------------------------------------------------------------
@@ -272,6 +575,12 @@ class ConvertOptions:
     gzip: bool
     centroid: str   # "none" | "vendor" | "cwt"
     bit_depth: int = 64
+    sha256: bool = False
+    # Fixed per run: built once in __post_init__, not per raw file
+    format_args: tuple[str, ...] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.format_args = ("--mzML", f"--{self.bit_depth}")
 
 
 def build_msconvert_cmd(
@@ -279,9 +588,9 @@ def build_msconvert_cmd(
     infile: Path,
     outdir: Path,
     outfile: str,
-    filters: list[str],
+    filters: tuple[str, ...],
     gzip: bool,
-    bit_depth: int = 64,
+    format_args: tuple[str, ...] = ("--mzML", "--64"),
 ) -> list[str]:
     """
     Build an msconvert command line.
@@ -289,7 +598,7 @@ def build_msconvert_cmd(
     """
     cmd = [
         msconvert, str(infile),
-        "--mzML", f"--{bit_depth}",
+        *format_args,
         "-o", str(outdir),
         "--outfile", outfile,
     ]
@@ -307,90 +616,143 @@ def convert_one(
     logs: Path,
     opt: ConvertOptions,
 ) -> dict:
-    """Convert one raw file into MS1-only and MS2-only mzML in the triada dirs."""
+    """
+    Convert one raw file into MS1-only and MS2-only mzML in the triada dirs.
+
+    MSConvert runs once to a full mzML (so the vendor file is read and
+    peak-picked a single time), which is then split by MS level.
+    """
     stem = safe_stem(raw_path)
+    raw_size, raw_mtime_ns = input_fingerprint(raw_path)
 
-    # Build centroiding filters (must be FIRST per ProteoWizard docs)
-    prefix_filters: list[str] = []
-    if opt.centroid == "vendor":
-        prefix_filters = ["peakPicking vendor msLevel=1-", "metadataFixer"]
-    elif opt.centroid == "cwt":
-        prefix_filters = ["peakPicking cwt msLevel=1-", "metadataFixer"]
-    elif opt.centroid == "none":
-        pass
-    else:
-        raise ValueError(f"centroid must be none|vendor|cwt, got '{opt.centroid}'")
+    prefix_filters = CENTROID_FILTERS[opt.centroid]
 
     triada_ms1.mkdir(parents=True, exist_ok=True)
     triada_ms2.mkdir(parents=True, exist_ok=True)
     logs.mkdir(parents=True, exist_ok=True)
 
     suffix = ".mzML.gz" if opt.gzip else ".mzML"
-    ms1_outfile = f"{stem}.ms1{suffix}"
-    ms2_outfile = f"{stem}.ms2{suffix}"
-
-    # --- MS1-only conversion ---
-    cmd1 = build_msconvert_cmd(
-        opt.msconvert, raw_path, triada_ms1, ms1_outfile,
-        filters=prefix_filters + ["msLevel 1"],
-        gzip=opt.gzip,
-        bit_depth=opt.bit_depth,
-    )
-    run_cmd(cmd1, log_path=logs / f"{stem}.ms1.msconvert.log")
-
-    ms1_final = triada_ms1 / ms1_outfile
-    if not ms1_final.exists() or ms1_final.stat().st_size == 0:
-        raise RuntimeError(
-            f"MS1 conversion produced no/empty output: {ms1_final}\n"
-            f"Check log: {logs / f'{stem}.ms1.msconvert.log'}"
+    ms1_final = triada_ms1 / f"{stem}.ms1{suffix}"
+    ms2_final = triada_ms2 / f"{stem}.ms2{suffix}"
+    log_path = logs / f"{stem}.msconvert.log"
+
+    # --- Single full conversion, next to the triada dirs ---
+    with tempfile.TemporaryDirectory(prefix=f".{stem}_", dir=triada_ms1.parent) as tmp:
+        tmp_dir = Path(tmp)
+        full_outfile = f"{stem}.full.mzML"
+        cmd = build_msconvert_cmd(
+            opt.msconvert, raw_path, tmp_dir, full_outfile,
+            filters=prefix_filters,
+            gzip=False,
+            format_args=opt.format_args,
         )
+        run_cmd(cmd, log_path=log_path)
 
-    # --- MS2+ conversion ---
-    cmd2 = build_msconvert_cmd(
-        opt.msconvert, raw_path, triada_ms2, ms2_outfile,
-        filters=prefix_filters + ["msLevel 2-"],
-        gzip=opt.gzip,
-        bit_depth=opt.bit_depth,
-    )
-    run_cmd(cmd2, log_path=logs / f"{stem}.ms2.msconvert.log")
+        full = tmp_dir / full_outfile
+        if not full.exists() or full.stat().st_size == 0:
+            raise RuntimeError(
+                f"Conversion produced no/empty output: {full}\n"
+                f"Check log: {log_path}"
+            )
 
-    ms2_final = triada_ms2 / ms2_outfile
-    if not ms2_final.exists() or ms2_final.stat().st_size == 0:
-        raise RuntimeError(
-            f"MS2 conversion produced no/empty output: {ms2_final}\n"
-            f"Check log: {logs / f'{stem}.ms2.msconvert.log'}"
-        )
+        # --- Split by MS level ---
+        n_ms1, n_ms2 = split_mzml_by_mslevel(full, ms1_final, ms2_final)
+
+    # Valid for MS1-only runs and blanks; the (empty) mzML is still written
+    for level, n in (("MS1", n_ms1), ("MS2", n_ms2)):
+        if n == 0:
+            with _PRINT_LOCK:
+                print(f"    [WARN] No {level} spectra in {raw_path.name}")
 
     return {
         "input": str(raw_path),
+        "input_size": raw_size,
+        "input_mtime_ns": raw_mtime_ns,
+        "options": conversion_settings(opt),
         "ms1": str(ms1_final),
         "ms2": str(ms2_final),
         "ms1_size": ms1_final.stat().st_size,
         "ms2_size": ms2_final.stat().st_size,
-        "ms1_sha256": sha256_file(ms1_final),
-        "ms2_sha256": sha256_file(ms2_final),
+        "ms1_sha256": sha256_file(ms1_final) if opt.sha256 else None,
+        "ms2_sha256": sha256_file(ms2_final) if opt.sha256 else None,
     }
 
 
+def conversion_settings(opt: ConvertOptions) -> dict:
+    """Options that change the conversion output (part of the cache key)."""
+    return {"centroid": opt.centroid, "gzip": opt.gzip, "bit_depth": opt.bit_depth}
+
+
+def load_prior_conversions(manifest_path: Path) -> dict[str, dict]:
+    """Index the conversions of a previous manifest by input path."""
+    try:
+        prior = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {r["input"]: r for r in prior.get("conversions", []) if "input" in r}
+
+
+def scan_sizes(*dirs: Path) -> dict[str, int]:
+    """Return {path: size} for the files in *dirs* from one scandir pass each."""
+    sizes: dict[str, int] = {}
+    for d in dirs:
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    if e.is_file():
+                        sizes[e.path] = e.stat().st_size
+        except FileNotFoundError:
+            pass
+    return sizes
+
+
+def cached_conversion(
+    raw_path: Path, prior: dict[str, dict], opt: ConvertOptions,
+    existing: dict[str, int],
+) -> Optional[dict]:
+    """
+    Return the prior record for *raw_path* if the raw input still has the
+    same input_fingerprint, was converted with the same options and both
+    outputs are non-empty in *existing* (see scan_sizes).
+    """
+    record = prior.get(str(raw_path))
+    if record is None or record.get("options") != conversion_settings(opt):
+        return None
+    if (record.get("input_size"), record.get("input_mtime_ns")) != input_fingerprint(raw_path):
+        return None
+    if not all(existing.get(record.get(key), 0) > 0 for key in ("ms1", "ms2")):
+        return None
+    if opt.sha256:
+        for key in ("ms1", "ms2"):
+            if not record.get(f"{key}_sha256"):
+                record[f"{key}_sha256"] = sha256_file(Path(record[key]))
+    return record
+
+
 # ---------------------------------------------------------------------------
 # raw_empty placeholders
 # ---------------------------------------------------------------------------
 
+def _touch_empty(path: Path) -> None:
+    open(path, "wb").close()
+
+
 def create_raw_empty_placeholders(raw_files: list[Path], raw_empty_dir: Path) -> None:
     raw_empty_dir.mkdir(parents=True, exist_ok=True)
-    manifest = []
-    for rf in raw_files:
-        placeholder = raw_empty_dir / (rf.name + ".empty")
-        placeholder.write_text("", encoding="utf-8")
-        manifest.append({"raw": str(rf), "placeholder": str(placeholder)})
+    placeholders = [raw_empty_dir / (rf.name + ".empty") for rf in raw_files]
+    # Independent metadata ops: overlap their latency (SMB/NTFS especially)
+    with ThreadPoolExecutor(max_workers=PLACEHOLDER_WORKERS) as ex:
+        list(ex.map(_touch_empty, placeholders))
+    manifest = [
+        {"raw": str(rf), "placeholder": str(ph)}
+        for rf, ph in zip(raw_files, placeholders)
+    ]
     (raw_empty_dir / "README.txt").write_text(
         "raw_empty/ contains placeholder files to satisfy downstream tooling\n"
         "that expects a RAW presence. These are NOT real vendor files.\n",
         encoding="utf-8",
     )
-    (raw_empty_dir / "raw_empty_manifest.json").write_text(
-        json.dumps(manifest, indent=2), encoding="utf-8"
-    )
+    write_json(raw_empty_dir / "raw_empty_manifest.json", manifest)
 
 
 # ---------------------------------------------------------------------------
@@ -408,6 +770,8 @@ def main() -> None:
         choices=sorted(VALID_PROTOCOLS),
         help="pridepy download protocol (default: ftp)",
     )
+    ap.add_argument("--download-jobs", type=int, default=DOWNLOAD_WORKERS,
+                    help=f"Parallel downloads for the ppx fallback (default: {DOWNLOAD_WORKERS})")
     ap.add_argument("--no-checksum", action="store_true",
                     help="Disable pridepy checksum check")
     ap.add_argument("--download-only", action="store_true",
@@ -419,10 +783,14 @@ def main() -> None:
     ap.add_argument("--gzip", action="store_true",
                     help="Gzip mzML output")
     ap.add_argument("--centroid", default="none",
-                    choices=["none", "vendor", "cwt"],
+                    choices=list(CENTROID_FILTERS),
                     help="Centroiding mode (default: none)")
     ap.add_argument("--bit-depth", type=int, default=64, choices=[32, 64],
                     help="Binary encoding precision (default: 64)")
+    ap.add_argument("--sha256", action="store_true",
+                    help="Record SHA-256 of MS1/MS2 outputs in the manifest")
+    ap.add_argument("--jobs", type=int, default=DEFAULT_JOBS,
+                    help=f"Parallel MSConvert conversions (default: {DEFAULT_JOBS})")
     args = ap.parse_args()
 
     pxd = args.pxd.strip()
@@ -460,7 +828,7 @@ def main() -> None:
             print(f"[WARN] pridepy failed: {e_pridepy}")
             print("[INFO] Falling back to ppx ...")
             try:
-                download_with_ppx(pxd, raw_dir)
+                download_with_ppx(pxd, raw_dir, args.download_jobs)
                 used_downloader = "ppx"
             except Exception as e_ppx:
                 raise RuntimeError(
@@ -479,10 +847,7 @@ def main() -> None:
     # Step 2: Collect raw candidates
     # ------------------------------------------------------------------
     print(f"\n[STEP 2] Scanning for raw files in {raw_dir} ...")
-    raw_files: list[Path] = []
-    for p in sorted(raw_dir.rglob("*")):
-        if is_raw_candidate(p):
-            raw_files.append(p)
+    raw_files: list[Path] = sorted(iter_raw_candidates(raw_dir))
 
     pair_problems = ensure_pairs(raw_files)
     download_report = {
@@ -521,18 +886,21 @@ def main() -> None:
     # ------------------------------------------------------------------
     print(f"\n[STEP 4] Converting raw -> mzML (MS1 + MS2) ...")
     msconvert_path = args.msconvert
-    if os.path.sep not in msconvert_path and "/" not in msconvert_path and "\\" not in msconvert_path:
+    if not any(sep in msconvert_path for sep in ("/", "\\")):  # bare name: look up in PATH
         msconvert_path = which_or_die(msconvert_path)
     print(f"  MSConvert: {msconvert_path}")
     print(f"  Centroid:  {args.centroid}")
     print(f"  Gzip:      {args.gzip}")
     print(f"  Bit depth: {args.bit_depth}")
+    print(f"  SHA-256:   {args.sha256}")
+    print(f"  Jobs:      {args.jobs}")
 
     opt = ConvertOptions(
         msconvert=msconvert_path,
         gzip=args.gzip,
         centroid=args.centroid,
         bit_depth=args.bit_depth,
+        sha256=args.sha256,
     )
 
     # Filter out companions — only convert primary raw files
@@ -542,17 +910,42 @@ def main() -> None:
     conversions: list[dict] = []
     errors: list[dict] = []
 
-    for i, rf in enumerate(primary_raw, 1):
-        print(f"\n  [{i}/{len(primary_raw)}] Converting {rf.name} ...")
-        try:
-            record = convert_one(rf, triada_ms1, triada_ms2, logs, opt)
+    # Skip raw files whose (size, mtime) match a previous successful run
+    manifest_path = root / "conversion_manifest.json"
+    prior = load_prior_conversions(manifest_path)
+    existing = scan_sizes(triada_ms1, triada_ms2)
+    todo: list[Path] = []
+    for rf in primary_raw:
+        record = cached_conversion(rf, prior, opt, existing)
+        if record is None:
+            todo.append(rf)
+        else:
             conversions.append(record)
-            print(f"    MS1: {record['ms1_size']:,} bytes -> {record['ms1']}")
-            print(f"    MS2: {record['ms2_size']:,} bytes -> {record['ms2']}")
-        except Exception as e:
-            err = {"input": str(rf), "error": str(e)}
-            errors.append(err)
-            print(f"    [ERROR] {e}")
+    if conversions:
+        print(f"  Unchanged since last run (skipped): {len(conversions)}")
+
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as ex:
+        futs = {
+            ex.submit(convert_one, rf, triada_ms1, triada_ms2, logs, opt): rf
+            for rf in todo
+        }
+        for i, fut in enumerate(as_completed(futs), 1):
+            rf = futs[fut]
+            with _PRINT_LOCK:
+                print(f"\n  [{i}/{len(todo)}] {rf.name}")
+                try:
+                    record = fut.result()
+                    conversions.append(record)
+                    print(f"    MS1: {record['ms1_size']:,} bytes -> {record['ms1']}")
+                    print(f"    MS2: {record['ms2_size']:,} bytes -> {record['ms2']}")
+                except Exception as e:
+                    err = {"input": str(rf), "error": str(e)}
+                    errors.append(err)
+                    print(f"    [ERROR] {e}")
+
+    # Keep manifest order stable regardless of completion order
+    conversions.sort(key=lambda r: r["input"])
+    errors.sort(key=lambda r: r["input"])
 
     manifest = {
         "pxd": pxd,
@@ -561,10 +954,7 @@ def main() -> None:
         "total_converted": len(conversions),
         "total_errors": len(errors),
     }
-    manifest_path = root / "conversion_manifest.json"
-    manifest_path.write_text(
-        json.dumps(manifest, indent=2), encoding="utf-8"
-    )
+    write_json(manifest_path, manifest)
 
     elapsed = time.time() - t0
     print(f"\n{'='*60}")